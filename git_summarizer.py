@@ -2,7 +2,7 @@
 """
 Git History Summarizer
 
-Usage: python git_summarizer.py --date 2024-01-01 --projects-folder /path/to/projects
+Usage: python git_summarizer.py [--no-cache]
 
 This program checks git history across all projects in a specified folder
 and summarizes the commits using the OpenAI API.
@@ -13,129 +13,426 @@ OPENAI_MODEL=gpt-5.5
 AUTHOR_FILTER=comma,separated,author,names
 """
 
+import argparse
+import asyncio
+import hashlib
+import math
 import os
+import re
+import sqlite3
 import sys
 import subprocess
 import json
+import time
+from array import array
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Iterator, NamedTuple, Optional, Tuple
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional, faster JSON serialization
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file in the same directory as this script
 script_dir = Path(__file__).parent
 load_dotenv(script_dir / ".env")  # local wins
 load_dotenv(Path.home() / ".claude" / ".env.global")  # fallback (override=False)
 
+# Maximum number of git processes run at the same time while scanning
+GIT_CONCURRENCY = 32
+
+# Characters with special meaning in POSIX extended regexes, escaped in author names
+ERE_SPECIAL_CHARS = re.compile(r"[.^$*+?()\[\]{}|\\]")
+
+# Summaries are cached on disk so re-running for the same date doesn't call OpenAI again.
+# Entries expire because git history for a day can still change (rebases, late pushes).
+CACHE_DIR = Path.home() / ".cache" / "git_summarizer"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Semantic cache: a near-duplicate commit history for the same date and counts (e.g. an amended
+# message) reuses the earlier summary instead of paying for a new chat completion.
+SEMANTIC_CACHE_DB = CACHE_DIR / "semcache.db"
+EMBEDDING_INPUT_CHARS = 8000
+
+# Non-empty commit body lines included in the prompt (see also MAX_BODY_CHARS)
+BODY_MAX_LINES = 3
+
+# git log reads a commit-graph file sequentially instead of looking up each commit in the packs.
+# Each repo's graph is (re)written at most this often; a marker file in CACHE_DIR records when.
+COMMIT_GRAPH_MARKER_DIR = CACHE_DIR / "commit-graph"
+COMMIT_GRAPH_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+def json_dumps_sorted(obj: Any) -> bytes:
+    """Serialize obj as compact JSON with sorted keys, using orjson when it is installed.
+
+    The stdlib fallback matches orjson's output for the request values this tool serializes
+    (strings, ints, plain decimal floats); floats in exponent form differ, which only costs
+    a one-time cache miss.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def env_number(name: str, default: str, parse: Callable[[str], Any], minimum: float) -> Any:
+    """Read a numeric setting from the environment, raising ValueError with a clear message."""
+    raw = os.getenv(name, default)
+    try:
+        value = parse(raw)
+    except ValueError:
+        kind = "an integer" if parse is int else "a number"
+        raise ValueError(f"{name} must be {kind}, got {raw!r}") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {raw!r}")
+    return value
+
+
+def author_pattern(authors: List[str]) -> str:
+    """Build one extended regex matching any of the given author names literally."""
+    return "(" + "|".join(ERE_SPECIAL_CHARS.sub(r"\\\g<0>", author) for author in authors) + ")"
+
+
+class Commit(NamedTuple):
+    """A single commit parsed from git log output."""
+    hash: str
+    author: str
+    date: str
+    subject: str
+    body: str = ''
+
+
 class GitHistorySummarizer:
-    def __init__(self, openai_key: str = None):
+    def __init__(self, openai_key: str = None, use_cache: bool = True):
         """Initialize the summarizer with OpenAI credentials."""
+        self.use_cache = use_cache
+        # Set once the final summary has been printed token by token (see _stream_completion)
+        self.summary_streamed = False
         self.openai_key = openai_key or os.getenv("OPENAI_API_KEY")
         self.model = os.getenv("OPENAI_MODEL", "gpt-5.5")
-        self.client = OpenAI(
+        self.embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+        self.semantic_threshold = env_number("SEMANTIC_CACHE_THRESHOLD", "0.95", float, minimum=0)
+        self.semantic_db = self._open_semantic_cache() if use_cache and self.openai_key else None
+        # Set WRITE_COMMIT_GRAPH=0 to never write commit-graph files into the scanned repos
+        self.write_commit_graph = os.getenv("WRITE_COMMIT_GRAPH", "1") != "0"
+        # Only the start of each commit body is sent; long bodies are mostly changelogs and noise
+        self.max_body_chars = env_number("MAX_BODY_CHARS", "200", int, minimum=1)
+        # Commit histories longer than this are summarized per project first (map-reduce)
+        self.max_prompt_chars = env_number("MAX_PROMPT_CHARS", "100000", int, minimum=1)
+
+    def _new_client(self, http_client: DefaultAsyncHttpxClient) -> Optional[AsyncOpenAI]:
+        """Create an OpenAI client on http_client, or None without an API key."""
+        if not self.openai_key:
+            return None
+        return AsyncOpenAI(
             api_key=self.openai_key,
             timeout=60.0,
             max_retries=2,
-        ) if self.openai_key else None
+            http_client=http_client,
+        )
+
+    def _open_semantic_cache(self) -> Optional[sqlite3.Connection]:
+        """Open (creating if needed) the semantic cache database."""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(SEMANTIC_CACHE_DB))
+            # Caches written before the label column existed are just discarded
+            columns = [row[1] for row in db.execute("PRAGMA table_info(entries)")]
+            if columns and "label" not in columns:
+                db.execute("DROP TABLE entries")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "model TEXT, label TEXT, date TEXT, total_commits INTEGER, project_count INTEGER, "
+                "embedding BLOB, response TEXT, ts INTEGER)"
+            )
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: semantic cache disabled: {e}")
+            return None
         
     def get_git_projects(self, projects_folder: str) -> List[str]:
-        """Find all git repositories in the projects folder."""
-        git_projects = []
+        """Find all git repositories (including bare ones) in the projects folder."""
         # Expand tilde to home directory if present
         expanded_path = os.path.expanduser(projects_folder)
-        projects_path = Path(expanded_path)
         
-        if not projects_path.exists():
+        if not os.path.exists(expanded_path):
             raise ValueError(f"Projects folder does not exist: {projects_folder}")
             
-        for item in projects_path.iterdir():
-            if item.is_dir():
-                git_dir = item / ".git"
-                if git_dir.exists():
-                    git_projects.append(str(item))
+        # scandir entries carry the file type from the directory listing, so is_dir() only
+        # needs an extra stat for symlinks
+        with os.scandir(expanded_path) as entries:
+            git_projects = [
+                entry.path for entry in entries
+                if entry.is_dir() and self._is_git_repo(entry.path)
+            ]
                     
         return git_projects
+
+    @staticmethod
+    def _is_git_repo(path: str) -> bool:
+        """Check for a working tree (.git) or a bare repository (HEAD file and objects/ dir)."""
+        if os.path.exists(os.path.join(path, ".git")):
+            return True
+        return os.path.isfile(os.path.join(path, "HEAD")) and os.path.isdir(os.path.join(path, "objects"))
     
-    def get_git_log(self, project_path: str, date: str) -> List[Dict[str, Any]]:
-        """Get git log for a specific project on a given date."""
+    async def _refresh_commit_graph(self, project_path: str) -> None:
+        """Write the repo's commit-graph if it hasn't been written in COMMIT_GRAPH_MAX_AGE_SECONDS.
+
+        Failures (e.g. a read-only repo) are ignored; git log works without a commit-graph.
+        """
+        marker = COMMIT_GRAPH_MARKER_DIR / hashlib.sha256(os.path.realpath(project_path).encode()).hexdigest()
         try:
-            # Change to project directory
-            os.chdir(project_path)
+            if time.time() - marker.stat().st_mtime < COMMIT_GRAPH_MAX_AGE_SECONDS:
+                return
+        except OSError:
+            pass
+
+        proc = await asyncio.create_subprocess_exec(
+            "git", "-C", project_path, "commit-graph", "write", "--reachable", "--split",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await proc.wait()
 
-            # Get author filter from environment
-            author_filter = os.getenv("AUTHOR_FILTER", "").strip()
+        # Mark the attempt even if it failed, so a broken repo isn't retried on every run
+        try:
+            COMMIT_GRAPH_MARKER_DIR.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
 
-            # Get local timezone offset to ensure git uses local time
-            local_tz = datetime.now().astimezone().strftime('%z')
+    async def _git_log_async(self, project_path: str, since_ts: int, until_ts: int, authors: List[str],
+                             semaphore: asyncio.Semaphore) -> List[Commit]:
+        """Get git log for a specific project between two epoch timestamps (inclusive).
 
-            # Get git log with detailed information for a specific date
+        Runs git with -C project_path rather than chdir'ing, so many of these can be
+        in flight at once; the semaphore bounds how many git processes run together.
+        """
+        try:
+            # Get git log with detailed information for the given time range
             # Use --date=format-local to display dates in local timezone
+            # Fields are separated by \x1f and -z terminates records with NUL, since subjects
+            # and bodies can contain '|' and newlines
+            # Merge commits add nothing to a summary
             cmd = [
-                "git", "log",
-                "--since", f"{date} 00:00:00 {local_tz}",
-                "--until", f"{date} 23:59:59 {local_tz}",
-                "--pretty=format:%H|%an|%ad|%s|%b",
+                "git", "-C", project_path, "log",
+                f"--after=@{since_ts}",
+                f"--before=@{until_ts}",
+                "--pretty=format:%H%x1f%an%x1f%ad%x1f%s%x1f%b",
                 "--date=format-local:%Y-%m-%d",
-                "--all"
+                "--no-merges",
+                "-z",
             ]
             
-            # Add author filter if specified
-            if author_filter:
-                authors = [author.strip() for author in author_filter.split(",")]
-                for author in authors:
-                    cmd.extend(["--author", author])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Add author filter if specified, as one alternation so git matches a single pattern
+            if authors:
+                cmd.extend(["--extended-regexp", "--author", author_pattern(authors)])
+
+            # Revisions go last. --branches --remotes HEAD skips notes/stash refs but keeps
+            # detached-HEAD work (rebase, bisect); --ignore-missing tolerates an unborn HEAD
+            cmd.extend(["--ignore-missing", "--branches", "--remotes", "HEAD"])
             
-            commits = []
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    parts = line.split('|', 4)
-                    if len(parts) >= 4:
-                        commit = {
-                            'hash': parts[0],
-                            'author': parts[1],
-                            'date': parts[2],
-                            'subject': parts[3],
-                            'body': parts[4] if len(parts) > 4 else ''
-                        }
-                        commits.append(commit)
-                        
-            return commits
+            async with semaphore:
+                if self.write_commit_graph:
+                    await self._refresh_commit_graph(project_path)
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await proc.communicate()
+
+            if proc.returncode != 0:
+                print(f"Error getting git log for {project_path}: {stderr.decode(errors='replace').strip()}")
+                return []
+
+            # Split the raw bytes and decode field by field instead of decoding the whole output first
+            records = (rec.split(b'\x1f', 4) for rec in stdout.split(b'\x00'))
+            return [
+                Commit(*(field.decode('utf-8', 'replace') for field in parts))
+                for parts in records if len(parts) >= 4
+            ]
             
-        except subprocess.CalledProcessError as e:
-            print(f"Error getting git log for {project_path}: {e}")
-            return []
         except Exception as e:
             print(f"Unexpected error for {project_path}: {e}")
             return []
+
+    async def _collect_git_logs(self, git_projects: List[str], since_ts: int, until_ts: int,
+                                authors: List[str]) -> List[List[Commit]]:
+        """Run git log for every project concurrently, returning results in project order."""
+        # Cap concurrent git processes to avoid running out of file descriptors on huge trees
+        semaphore = asyncio.Semaphore(GIT_CONCURRENCY)
+        return await asyncio.gather(
+            *(self._git_log_async(project_path, since_ts, until_ts, authors, semaphore) for project_path in git_projects)
+        )
     
-    def format_commits_for_summary(self, project_name: str, commits: List[Dict[str, Any]]) -> str:
-        """Format commits into a readable string for summarization."""
+    def _trim_body(self, body: str) -> str:
+        """Keep the first BODY_MAX_LINES non-empty lines of a commit body, up to max_body_chars."""
+        lines = [line for line in body.splitlines() if line.strip()][:BODY_MAX_LINES]
+        return "\n".join(lines)[:self.max_body_chars]
+
+    def _iter_commit_lines(self, project_name: str, commits: List[Commit]) -> Iterator[str]:
+        """Yield a project's commits as readable text chunks for summarization.
+
+        Chunks from every project are joined once in run(), so no per-project string is built.
+        """
         if not commits:
-            return f"Project: {project_name}\nNo commits found in the specified date range.\n"
+            yield f"Project: {project_name}\nNo commits found in the specified date range.\n\n\n"
+            return
             
-        formatted = f"Project: {project_name}\n"
-        formatted += f"Total commits: {len(commits)}\n\n"
+        yield f"Project: {project_name}\n"
+        yield f"Total commits: {len(commits)}\n\n"
         
         for commit in commits:
-            formatted += f"Date: {commit['date']}\n"
-            formatted += f"Author: {commit['author']}\n"
-            formatted += f"Subject: {commit['subject']}\n"
-            if commit['body'].strip():
-                formatted += f"Body: {commit['body']}\n"
-            formatted += f"Hash: {commit['hash']}\n"
-            formatted += "-" * 50 + "\n"
+            yield from self._iter_commit_block(commit)
             
-        return formatted
+        yield "\n\n"
+
+    def _iter_commit_block(self, commit: Commit) -> Iterator[str]:
+        """Yield the text chunks describing a single commit."""
+        yield f"Date: {commit.date}\n"
+        yield f"Author: {commit.author}\n"
+        yield f"Subject: {commit.subject}\n"
+        body = self._trim_body(commit.body)
+        if body:
+            yield f"Body: {body}\n"
+        yield f"Hash: {commit.hash}\n"
+        yield "-" * 50 + "\n"
+
+    def _split_for_prompt(self, project_name: str, commits: List[Commit]) -> List[List[Commit]]:
+        """Group a project's commits so each group's formatted text fits in max_prompt_chars.
+
+        A single commit larger than the budget still gets a group of its own.
+        """
+        # Room for the "Project: ... (part i of n)" / "Total commits" header and trailing newlines
+        overhead = len(f"Project: {project_name} (part 9999 of 9999)\nTotal commits: 999999\n\n\n\n")
+        budget = self.max_prompt_chars - overhead
+        groups, current, size = [], [], 0
+        for commit in commits:
+            length = sum(len(chunk) for chunk in self._iter_commit_block(commit))
+            if current and size + length > budget:
+                groups.append(current)
+                current, size = [], 0
+            current.append(commit)
+            size += length
+        if current:
+            groups.append(current)
+        return groups
     
-    def summarize_with_openai(self, content: str, date: str, total_commits: int, project_count: int) -> str:
-        """Summarize the git history using OpenAI API."""
+    def _cache_path(self, key: str) -> Path:
+        """Return the cache file for a request key."""
+        return CACHE_DIR / f"{key}.txt"
+
+    def _read_cache(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None if missing or expired."""
+        path = self._cache_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+                return None
+            return path.read_text()
+        except OSError:
+            return None
+
+    def _write_cache(self, key: str, summary: str) -> None:
+        """Store a summary in the cache; failures only cost a future cache miss."""
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._cache_path(key).write_text(summary)
+        except OSError as e:
+            print(f"Warning: could not write summary cache: {e}")
+
+    async def _embed(self, client: AsyncOpenAI, content: str) -> Optional[array]:
+        """Return a unit-length embedding of the start of content, or None if embedding fails."""
+        try:
+            response = await client.embeddings.create(
+                model=self.embedding_model,
+                input=content[:EMBEDDING_INPUT_CHARS],
+            )
+        except Exception as e:
+            print(f"Warning: could not embed commits for semantic cache: {e}")
+            return None
+        vector = response.data[0].embedding
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return array("f", (x / norm for x in vector))
+
+    def _semantic_lookup(self, embedding: array, label: str, date: str, total_commits: int,
+                         project_count: int) -> Optional[str]:
+        """Return the cached summary most similar to embedding, if it clears the threshold.
+
+        Only entries for the same model, date and commit/project counts are considered, since
+        the summary is asked to quote those counts verbatim. The content label must match too,
+        so a per-project or reduce-step summary never answers a different kind of request.
+        """
+        try:
+            rows = self.semantic_db.execute(
+                "SELECT embedding, response FROM entries WHERE model = ? AND label = ? "
+                "AND date = ? AND total_commits = ? AND project_count = ? AND ts >= ?",
+                (self.model, label, date, total_commits, project_count, int(time.time()) - CACHE_TTL_SECONDS),
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Warning: could not read semantic cache: {e}")
+            return None
+        best_score, best_response = 0.0, None
+        for blob, response in rows:
+            cached = array("f")
+            cached.frombytes(blob)
+            if len(cached) != len(embedding):
+                continue
+            # Both vectors are unit length, so the dot product is the cosine similarity
+            score = sum(a * b for a, b in zip(embedding, cached))
+            if score > best_score:
+                best_score, best_response = score, response
+        return best_response if best_score >= self.semantic_threshold else None
+
+    def _semantic_store(self, embedding: array, label: str, date: str, total_commits: int,
+                        project_count: int, summary: str) -> None:
+        """Record a summary in the semantic cache and drop expired entries."""
+        now = int(time.time())
+        try:
+            self.semantic_db.execute("DELETE FROM entries WHERE ts < ?", (now - CACHE_TTL_SECONDS,))
+            self.semantic_db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.model, label, date, total_commits, project_count, embedding.tobytes(), summary, now),
+            )
+            self.semantic_db.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: could not write semantic cache: {e}")
+
+    async def _stream_completion(self, client: AsyncOpenAI, request_args: Dict[str, Any]) -> str:
+        """Run a streaming chat completion, printing tokens as they arrive; return the full text."""
+        response = await client.chat.completions.create(**request_args, stream=True)
+        pieces = []
+        async for chunk in response:
+            # Some chunks (e.g. content-filter results) carry no choices
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if not pieces:
+                print_summary_header()
+                self.summary_streamed = True
+            pieces.append(delta)
+            sys.stdout.write(delta)
+            sys.stdout.flush()
+        if pieces:
+            sys.stdout.write("\n")
+        return "".join(pieces)
+
+    async def summarize_with_openai(self, client: Optional[AsyncOpenAI], content: str, date: str,
+                                    total_commits: int, project_count: int,
+                                    content_label: str = "commit history", stream: bool = False) -> str:
+        """Summarize the git history using OpenAI API.
+
+        client is None when no API key is configured; cached summaries are still returned.
+        content_label describes what content is in the prompt, e.g. per-project summaries
+        in the reduce step of _summarize_map_reduce, and scopes semantic cache matches.
+        With stream=True, tokens are printed under the summary header as they arrive and
+        summary_streamed is set.
+        """
         try:
-            if not self.client:
-                raise RuntimeError("OPENAI_API_KEY not found in environment variables")
             request_args = {
                 "model": self.model,
                 "messages": [
@@ -153,7 +450,7 @@ class GitHistorySummarizer:
                     {
                         "role": "user",
                         "content": f"On {date}, exactly {total_commits} commits were made across {project_count} projects. "
-                                   f"Use these exact numbers in your summary. Here is the commit history:\n\n{content}"
+                                   f"Use these exact numbers in your summary. Here is the {content_label}:\n\n{content}"
                     }
                 ],
             }
@@ -164,19 +461,94 @@ class GitHistorySummarizer:
                 request_args["max_tokens"] = int(os.getenv("MAX_TOKENS", "1000"))
                 request_args["temperature"] = float(os.getenv("TEMPERATURE", "0.3"))
 
-            response = self.client.chat.completions.create(
-                **request_args
-            )
+            # The key covers model, prompts (which embed date, counts and commits) and sampling settings
+            cache_key = hashlib.sha256(json_dumps_sorted(request_args)).hexdigest()
+            if self.use_cache:
+                cached = self._read_cache(cache_key)
+                if cached is not None:
+                    print("Using cached summary.")
+                    return cached
+
+            if not client:
+                raise RuntimeError("OPENAI_API_KEY not found in environment variables")
+
+            embedding = await self._embed(client, content) if self.semantic_db else None
+            if embedding is not None:
+                similar = self._semantic_lookup(embedding, content_label, date, total_commits, project_count)
+                if similar is not None:
+                    print("Using cached summary of near-identical commits.")
+                    self._write_cache(cache_key, similar)
+                    return similar
+
+            if stream:
+                print("Generating summary with OpenAI...")
+                summary = await self._stream_completion(client, request_args)
+            else:
+                response = await client.chat.completions.create(
+                    **request_args
+                )
+                summary = response.choices[0].message.content
             
-            return response.choices[0].message.content
+            if self.use_cache and summary:
+                self._write_cache(cache_key, summary)
+                if embedding is not None:
+                    self._semantic_store(embedding, content_label, date, total_commits, project_count, summary)
+            return summary
             
         except Exception as e:
             # Raise (don't return the error AS the summary) so main() exits nonzero and never
             # prints/pbcopies the failure as if it were a real summary.
             raise RuntimeError(f"OpenAI summary generation failed: {e}") from e
     
+    async def _summarize_map_reduce(self, client: Optional[AsyncOpenAI], results: List[Tuple[str, List[Commit]]],
+                                    date: str, total_commits: int, project_count: int) -> str:
+        """Summarize pieces of at most max_prompt_chars concurrently, then summarize those summaries.
+
+        Used when the combined commit history is too large for one prompt. Each project is split
+        into as many pieces as it needs; if everything fits in one piece, that piece is summarized
+        directly without a reduce step.
+        """
+        pieces = []
+        for project_path, commits in results:
+            if not commits:
+                continue
+            project_name = os.path.basename(project_path)
+            groups = self._split_for_prompt(project_name, commits)
+            for index, group in enumerate(groups, 1):
+                label = project_name if len(groups) == 1 else f"{project_name} (part {index} of {len(groups)})"
+                pieces.append((label, group))
+
+        if len(pieces) == 1:
+            label, group = pieces[0]
+            return await self.summarize_with_openai(
+                client, "".join(self._iter_commit_lines(label, group)),
+                date, total_commits, project_count, stream=True,
+            )
+
+        print(f"Commit history is large; summarizing it in {len(pieces)} pieces first...")
+        piece_summaries = await asyncio.gather(*(
+            self.summarize_with_openai(
+                client, "".join(self._iter_commit_lines(label, group)),
+                date, len(group), 1,
+                content_label=f"commit history of {label}",
+            )
+            for label, group in pieces
+        ))
+        combined = "\n\n".join(
+            f"Project: {label}\n{summary}"
+            for (label, _), summary in zip(pieces, piece_summaries)
+        )
+        return await self.summarize_with_openai(
+            client, combined, date, total_commits, project_count,
+            content_label="per-project summaries of the commit history", stream=True,
+        )
+
     def run(self, projects_folder: str, date: str) -> str:
         """Main method to run the git history summarization."""
+        return asyncio.run(self.run_async(projects_folder, date))
+
+    async def run_async(self, projects_folder: str, date: str) -> str:
+        """Scan the projects, print the commits found, then summarize them."""
         print(f"Scanning for git projects in: {projects_folder}")
         print(f"Looking for commits on {date}...")
         
@@ -188,39 +560,73 @@ class GitHistorySummarizer:
         
         print(f"Found {len(git_projects)} git repositories")
         
-        # Collect all commit data
-        all_commits_data = ""
-        total_commits = 0
-        projects_with_commits = 0
+        # Read the author filter once instead of per project
+        author_filter = os.getenv("AUTHOR_FILTER", "").strip()
+        authors = [author.strip() for author in author_filter.split(",")] if author_filter else []
 
-        for project_path in git_projects:
-            project_name = os.path.basename(project_path)
-            # print(f"Processing: {project_name}")
+        # Local midnight to local midnight as epoch seconds, so git doesn't reparse dates per repo.
+        # Adding a day to the naive date keeps DST-change days at their real length.
+        day_start = datetime.strptime(date, "%Y-%m-%d")
+        since_ts = int(day_start.timestamp())
+        until_ts = int((day_start + timedelta(days=1)).timestamp()) - 1
 
-            commits = self.get_git_log(project_path, date)
-            total_commits += len(commits)
-            if commits:
-                projects_with_commits += 1
-                print(f"Found {len(commits)} commits in {project_name}")
-                for commit in commits:
-                    print(f"\t{commit['date']}\t{commit['author']}\tCommit: {commit['subject']}")
-            
-            project_summary = self.format_commits_for_summary(project_name, commits)
-            all_commits_data += project_summary + "\n\n"
+        # git log is process-startup bound and independent per repo, so overlap all the scans
+        logs = await self._collect_git_logs(git_projects, since_ts, until_ts, authors)
+
+        # The same commit can appear in several projects (clones, forks, submodules); keep the first
+        seen = set()
+        results = []
+        for project_path, commits in zip(git_projects, logs):
+            unique = [commit for commit in commits if commit.hash not in seen and not seen.add(commit.hash)]
+            results.append((project_path, unique))
+        duplicates = sum(len(commits) for commits in logs) - len(seen)
+        if duplicates:
+            print(f"Skipped {duplicates} duplicate commits already found in another project")
+
+        total_commits = len(seen)
+        projects_with_commits = sum(1 for _, commits in results if commits)
         
         if total_commits == 0:
             return "No commits found in the specified date range across all projects."
         
-        print(f"Total commits found: {total_commits}")
-        print("Generating summary with OpenAI...")
-        
-        summary = self.summarize_with_openai(all_commits_data, date, total_commits, projects_with_commits)
+        all_commits_data = "".join(
+            chunk
+            for project_path, commits in results
+            for chunk in self._iter_commit_lines(os.path.basename(project_path), commits)
+        )
+
+        for project_path, commits in results:
+            if commits:
+                print(f"Found {len(commits)} commits in {os.path.basename(project_path)}")
+                for commit in commits:
+                    print(f"\t{commit.date}\t{commit.author}\tCommit: {commit.subject}")
         
-        return summary
+        print(f"Total commits found: {total_commits}")
+
+        # One OpenAI client per run, shared by all of its requests. Its HTTP client (openai's
+        # defaults) is closed before this run's event loop ends, so no pooled connection outlives it.
+        async with DefaultAsyncHttpxClient() as http_client:
+            client = self._new_client(http_client)
+            if len(all_commits_data) > self.max_prompt_chars:
+                return await self._summarize_map_reduce(client, results, date, total_commits,
+                                                        projects_with_commits)
+            return await self.summarize_with_openai(client, all_commits_data, date, total_commits,
+                                                    projects_with_commits, stream=True)
+
+
+def print_summary_header() -> None:
+    """Print the banner shown above the final summary."""
+    print("\n" + "="*60)
+    print("GIT HISTORY SUMMARY")
+    print("="*60)
 
 
 def main() -> str:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Summarize git history across projects.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"always call OpenAI instead of reusing summaries cached in {CACHE_DIR}")
+    args = parser.parse_args()
     
     print("Git History Summarizer")
     print("=" * 30)
@@ -277,15 +683,14 @@ def main() -> str:
     else:
         print("No author filter applied (showing all authors)")
     
-    # Create summarizer and run
-    summarizer = GitHistorySummarizer()
-    
     try:
+        # Create summarizer and run
+        summarizer = GitHistorySummarizer(use_cache=not args.no_cache)
         summary = summarizer.run(workspace_folder, selected_date)
-        print("\n" + "="*60)
-        print("GIT HISTORY SUMMARY")
-        print("="*60)
-        print(summary)
+        # A freshly generated summary was already printed as it streamed in
+        if not summarizer.summary_streamed:
+            print_summary_header()
+            print(summary)
 
         import subprocess
         subprocess.run(["pbcopy"], input=summary.encode(), check=True)